@@ -1,7 +1,13 @@
+import functools
 import os
 from dotenv import load_dotenv
 
-load_dotenv()
+@functools.cache
+def _load_env():
+    """Parse .env exactly once per process, even across re-imports/reloads."""
+    load_dotenv()
+
+_load_env()
 
 class Config:
     # ========== PLATFORM SELECTION ==========
@@ -21,7 +27,7 @@ class Config:
     # Get API key from: https://console.cloud.google.com/
     # Enable YouTube Data API v3 for your project
     YOUTUBE_API_KEY = os.getenv('YOUTUBE_API_KEY', '')
-    YOUTUBE_KEYWORDS = ['Draesontel']  # Keywords to search in YouTube videos/comments
+    YOUTUBE_KEYWORDS = ('Draesontel',)  # Keywords to search in YouTube videos/comments
     YOUTUBE_CHANNEL_NAME = os.getenv('YOUTUBE_CHANNEL_NAME', '')  # Your channel name (optional)
 
     # ========== MASTODON API (FREE and open source) ==========
@@ -29,7 +35,7 @@ class Config:
     # Or any other Mastodon instance
     MASTODON_INSTANCE_URL = os.getenv('MASTODON_INSTANCE_URL', 'https://mastodon.social')
     MASTODON_ACCESS_TOKEN = os.getenv('MASTODON_ACCESS_TOKEN', '')
-    MASTODON_KEYWORDS = ['Draesontel']  # Keywords/hashtags to monitor
+    MASTODON_KEYWORDS = ('Draesontel',)  # Keywords/hashtags to monitor
 
     # ========== AI/ML SETTINGS ==========
     # Ollama settings
@@ -41,8 +47,8 @@ class Config:
     HF_SENTIMENT_MODEL = "distilbert-base-uncased-finetuned-sst-2-english"
     HF_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
 
-    # Intent categories
-    INTENT_LABELS = [
+    # Intent categories (tuple: static for the process, safe to share)
+    INTENT_LABELS = (
         "pricing and costs",
         "technical support issue",
         "positive feedback",
@@ -51,13 +57,17 @@ class Config:
         "general question",
         "spam or irrelevant",
         "question about availability"
-    ]
+    )
 
     # ========== GENERAL MONITORING SETTINGS ==========
     # Default keywords to monitor (used by Reddit and as fallback)
-    MONITOR_KEYWORDS = [
-        'Draesontel'  # my product
-    ]
+    MONITOR_KEYWORDS = (
+        'Draesontel',  # my product
+    )
+
+    # Batch sizes for the batched HF pipeline calls (per monitoring cycle)
+    INTENT_BATCH_SIZE = 16
+    SENTIMENT_BATCH_SIZE = 32
 
     # Confidence thresholds
     CANNED_RESPONSE_THRESHOLD = 0.75
@@ -68,4 +78,9 @@ class Config:
     MIN_RESPONSE_LENGTH = 20
 
     # Interactive mode (ask before posting)
-    INTERACTIVE_MODE = True  # Set to False for fully automated posting
\ No newline at end of file
+    INTERACTIVE_MODE = True  # Set to False for fully automated posting
+
+
+# Shared singleton — settings are static for the life of the process, so
+# everything should reuse this instead of constructing Config() again.
+config = Config()
\ No newline at end of file
@@ -0,0 +1,70 @@
+import queue
+import threading
+
+class InteractiveReviewer:
+    """
+    Runs the "modify this reply?" prompt on a dedicated thread so platform
+    monitors never block on stdin. Monitors enqueue pending replies and keep
+    scanning; this worker prompts the user one item at a time and then posts
+    or records the reply through the callback supplied with each item.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        """Start the reviewer thread (idempotent)."""
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._worker,
+                    name='interactive-reviewer',
+                    daemon=True
+                )
+                self._thread.start()
+
+    def submit(self, description, response_text, on_approved, on_skipped=None):
+        """
+        Queue a reply for user review.
+
+        Args:
+            description: One-line summary shown before the prompt
+            response_text: The proposed reply text
+            on_approved: Called with the (possibly edited) reply text
+            on_skipped: Called when the user skips this reply (optional)
+        """
+        self.start()
+        self._queue.put((description, response_text, on_approved, on_skipped))
+
+    def pending_count(self):
+        """Number of replies still waiting for review."""
+        return self._queue.qsize()
+
+    def _worker(self):
+        while True:
+            description, response_text, on_approved, on_skipped = self._queue.get()
+            try:
+                print(f"\n📝 REVIEW: {description}")
+                print(f"   Proposed reply: {response_text}")
+                user_input = input("Modify this reply? (y/n/skip): ")
+
+                if user_input == "skip":
+                    if on_skipped:
+                        on_skipped()
+                    continue
+
+                if user_input == "y":
+                    response_text = input("Enter response: ")
+
+                on_approved(response_text)
+
+            except Exception as e:
+                print(f"   ❌ Review failed: {e}")
+            finally:
+                self._queue.task_done()
+
+# One shared reviewer so prompts from different platform monitors are
+# serialized instead of fighting over stdin
+reviewer = InteractiveReviewer()
@@ -0,0 +1,43 @@
+# Optional C-extension matcher. Falls back to plain substring scanning
+# when pyahocorasick isn't installed.
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+class KeywordMatcher:
+    """
+    Case-insensitive multi-keyword matcher.
+
+    With pyahocorasick installed, all keywords are compiled once into an
+    Aho-Corasick automaton so any text is scanned in a single O(n) pass no
+    matter how many keywords are monitored. Without it, falls back to the
+    original per-keyword substring check.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = tuple(keywords)
+        # casefold() is the unicode-correct lowering and is computed once per
+        # keyword here rather than per comparison
+        self._lowered = tuple(kw.casefold() for kw in self.keywords)
+        self._automaton = None
+
+        if ahocorasick is not None and self._lowered:
+            automaton = ahocorasick.Automaton()
+            for kw in self._lowered:
+                automaton.add_word(kw, kw)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def matches(self, text):
+        """Return True if any monitored keyword appears in the text."""
+        if not self._lowered:
+            return False
+
+        # One folded copy per text, shared by every keyword check
+        text_lc = text.casefold()
+
+        if self._automaton is not None:
+            return next(self._automaton.iter(text_lc), None) is not None
+
+        return any(kw in text_lc for kw in self._lowered)
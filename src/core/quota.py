@@ -0,0 +1,58 @@
+import threading
+import time
+
+
+class QuotaExhausted(Exception):
+    """Raised when an API reports its quota is spent for the current window."""
+
+
+class TokenBucket:
+    """
+    Token bucket for spreading a fixed API quota over its window.
+
+    Tokens refill continuously at capacity / window_seconds. Callers take
+    tokens matching each endpoint's known cost before issuing the call, so
+    quota becomes a smooth throughput limit instead of a burst that spends
+    the whole budget early and leaves every later call failing instantly.
+    """
+
+    def __init__(self, capacity: float, window_seconds: float):
+        self.capacity = float(capacity)
+        self.rate = float(capacity) / float(window_seconds)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity,
+                           self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, cost: float = 1.0, block: bool = True) -> bool:
+        """
+        Take `cost` tokens. Blocks until they have refilled when block=True;
+        otherwise returns False if they aren't available right now.
+        """
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= cost:
+                    self._tokens -= cost
+                    return True
+                wait = (cost - self._tokens) / self.rate
+
+            if not block:
+                return False
+            time.sleep(wait)
+
+    def drain(self):
+        """
+        Empty the bucket. Used when the API itself reports the quota spent
+        (e.g. after a process restart reset the bucket to full while the
+        server-side window is still exhausted) so later calls fail fast
+        locally instead of burning round-trips on guaranteed 403s.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens = 0.0
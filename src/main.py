@@ -1,9 +1,9 @@
+import asyncio
 import time
-import schedule
 from datetime import datetime
 from models.database import Database
 from services.response_generator import ResponseGenerator
-from config.settings import Config
+from config.settings import config
 from services.monitors.reddit_monitor import RedditMonitor
 from services.monitors.youtube_monitor import YouTubeMonitor
 from services.monitors.mastodon_monitor import MastodonMonitor
@@ -15,7 +15,7 @@ class MultiPlatformSocialAgent:
     """
 
     def __init__(self):
-        self.config = Config()
+        self.config = config
         self.db = Database()
 
         print("Initializing Response Generator (loading ML models)...")
@@ -72,16 +72,23 @@ class MultiPlatformSocialAgent:
         print(f"✅ {len(self.monitors)} platform(s) initialized successfully")
         print("="*60 + "\n")
 
-    def monitor_all_platforms(self):
-        """Monitor all enabled platforms for mentions."""
+    async def monitor_all_platforms(self):
+        """Monitor all enabled platforms concurrently for mentions."""
         total_processed = 0
 
-        for monitor in self.monitors:
-            try:
-                processed_count = monitor.process_mentions()
-                total_processed += processed_count
-            except Exception as e:
-                print(f"❌ Error monitoring {monitor.platform_name}: {e}")
+        # Each monitor spends its time blocked on network I/O, so run them
+        # in threads and overlap the waits: the cycle takes max(per-platform
+        # latency) instead of the sum.
+        results = await asyncio.gather(
+            *(asyncio.to_thread(monitor.process_mentions) for monitor in self.monitors),
+            return_exceptions=True
+        )
+
+        for monitor, result in zip(self.monitors, results):
+            if isinstance(result, Exception):
+                print(f"❌ Error monitoring {monitor.platform_name}: {result}")
+            else:
+                total_processed += result
 
         # Print overall stats
         if total_processed > 0:
@@ -101,6 +108,19 @@ class MultiPlatformSocialAgent:
         print(f"   Avg similarity: {stats['avg_similarity']:.2f}")
         print(f"{'='*60}\n")
 
+    # Seconds between cycle starts
+    MONITOR_INTERVAL = 600
+
+    async def _run_loop(self):
+        """Monitor immediately, then on a fixed 10-minute cadence."""
+        next_run = time.monotonic()
+        while True:
+            await self.monitor_all_platforms()
+            # Sleep exactly to the next deadline (monotonic, so wall-clock
+            # jumps don't matter and cycle time doesn't add drift)
+            next_run += self.MONITOR_INTERVAL
+            await asyncio.sleep(max(0, next_run - time.monotonic()))
+
     def run(self):
         """Run the agent with scheduling."""
         print("=" * 60)
@@ -111,21 +131,13 @@ class MultiPlatformSocialAgent:
         print("\n   Press Ctrl+C to stop")
         print("=" * 60)
 
-        # Run immediately
-        self.monitor_all_platforms()
-
-        # Schedule to run every 10 minutes
-        schedule.every(10).minutes.do(self.monitor_all_platforms)
-
-        while True:
-            try:
-                schedule.run_pending()
-                time.sleep(60)
-            except KeyboardInterrupt:
-                print("\n🛑 Stopping agent...")
-                self.print_stats()
-                print("✅ Agent stopped successfully!")
-                break
+        try:
+            asyncio.run(self._run_loop())
+        except KeyboardInterrupt:
+            print("\n🛑 Stopping agent...")
+            self.db.flush()
+            self.print_stats()
+            print("✅ Agent stopped successfully!")
 
 if __name__ == "__main__":
     agent = MultiPlatformSocialAgent()
@@ -1,36 +1,91 @@
 import sqlite3
 import json
-import pickle
-from datetime import datetime
+import threading
+import atexit
 import os
+import pathlib
+import time
+import numpy as np
+
+# Resolved once at import: __file__ is at <root>/src/models/database.py,
+# so the project root is two parents up and databases live in <root>/data
+_PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[2]
+_DATA_DIR = _PROJECT_ROOT / 'data'
+_DATA_DIR.mkdir(exist_ok=True)
 
 class Database:
     def __init__(self, db_name='social_agent.db'):
-        # Get the project root directory
-        # __file__ is at: <root>/src/models/database.py
-        # Go up: models -> src -> root
-        current_file = os.path.abspath(__file__)
-        models_dir = os.path.dirname(current_file)  # src/models
-        src_dir = os.path.dirname(models_dir)        # src
-        project_root = os.path.dirname(src_dir)      # project root
-
         # Build path to database in data directory
-        self.db_name = os.path.join(project_root, 'data', db_name)
-
-        # Ensure the data directory exists
-        db_dir = os.path.dirname(self.db_name)
-        if not os.path.exists(db_dir):
-            os.makedirs(db_dir)
+        self.db_name = str(_DATA_DIR / db_name)
 
         print(f"Database path: {self.db_name}")
         print(f"Database exists: {os.path.exists(self.db_name)}")
 
+        # One long-lived connection shared by all methods.
+        # Opening a fresh connection per query was the dominant I/O cost in the
+        # per-post loop (header parse + page cache init on every call).
+        # check_same_thread=False + a lock lets monitor threads share it safely.
+        self._conn = sqlite3.connect(self.db_name, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+
+        # WAL mode so reads don't block writes, relaxed sync for fewer fsyncs
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('PRAGMA temp_store=MEMORY')
+        self._conn.execute('PRAGMA cache_size=-20000')
+
+        atexit.register(self.close)
+
         self.init_db()
-    
+
+        # Preload every known post_id so is_processed becomes an O(1)
+        # set-membership check instead of a SQL round-trip per mention.
+        cursor = self._conn.cursor()
+        cursor.execute('SELECT post_id FROM processed_posts')
+        self._processed_ids = {row[0] for row in cursor.fetchall()}
+
+        # Rows buffered by mark_processed until the next flush(). Writing a
+        # whole monitoring cycle in one transaction costs one fsync instead
+        # of one per post.
+        self._pending = []
+
+        # Cached (meta, embedding matrix) for the canned responses, built on
+        # first use and invalidated when a canned response is added
+        self._canned_cache = None
+
+        # Running stats so get_stats never rescans the growing table:
+        # seeded from SQL once here, then maintained incrementally in
+        # mark_processed (online means for the two averages)
+        cursor.execute('''
+            SELECT
+                COUNT(*) as total,
+                SUM(CASE WHEN response_type = 'canned' THEN 1 ELSE 0 END) as canned,
+                SUM(CASE WHEN response_type = 'ai' THEN 1 ELSE 0 END) as ai,
+                AVG(confidence) as avg_conf,
+                AVG(similarity_score) as avg_sim
+            FROM processed_posts
+        ''')
+        row = cursor.fetchone()
+        self._total_processed = row['total'] or 0
+        self._canned_count = row['canned'] or 0
+        self._ai_count = row['ai'] or 0
+        self._avg_confidence = row['avg_conf'] or 0.0
+        self._avg_similarity = row['avg_sim'] or 0.0
+
+    def close(self):
+        """Flush pending writes and close the shared connection (registered with atexit)."""
+        if self._conn is not None:
+            try:
+                self.flush()
+                self._conn.close()
+            except sqlite3.ProgrammingError:
+                pass  # Already closed
+            self._conn = None
+
     def init_db(self):
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        
+        cursor = self._conn.cursor()
+
         # Table for processed posts
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS processed_posts (
@@ -42,13 +97,13 @@ class Database:
                 intent TEXT,
                 sentiment TEXT,
                 confidence REAL,
-                processed_at TIMESTAMP,
+                processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 response_sent TEXT,
                 response_type TEXT,
                 similarity_score REAL
             )
         ''')
-        
+
         # Table for canned responses with embeddings
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS canned_responses (
@@ -60,7 +115,25 @@ class Database:
                 embedding BLOB
             )
         ''')
-        
+
+        # post_id already has an implicit unique index; this one keeps the
+        # per-cycle get_stats aggregate off a full table scan as history grows
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_response_type
+            ON processed_posts(response_type)
+        ''')
+
+        # ETag cache for YouTube conditional GETs: on an HTTP 304 the cached
+        # body is replayed instead of re-downloading unchanged comment lists
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS youtube_etag_cache (
+                key TEXT PRIMARY KEY,
+                etag TEXT,
+                body BLOB,
+                ts INTEGER
+            )
+        ''')
+
         # Performance metrics
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS metrics (
@@ -73,10 +146,7 @@ class Database:
                 avg_response_time REAL
             )
         ''')
-        
-        conn.commit()
-        conn.close()
-        
+
         # self.add_default_responses()
 
 
@@ -125,27 +195,68 @@ class Database:
     #             'intent': 'general question'
     #         }
     #     ]
-        
-    #     conn = sqlite3.connect(self.db_name)
-    #     cursor = conn.cursor()
-        
+
+    #     cursor = self._conn.cursor()
+
     #     for item in defaults:
     #         cursor.execute('''
     #             INSERT OR IGNORE INTO canned_responses (keyword, response_template, category, intent)
     #             VALUES (?, ?, ?, ?)
     #         ''', (item['keyword'], item['response'], item['category'], item['intent']))
-        
-    #     conn.commit()
-    #     conn.close()
-    
+
+    def add_canned_response(self, keyword, response_template, category, intent, embedding=None):
+        """
+        Add a canned response. The embedding is stored as raw float16 bytes
+        (np.tobytes), not a pickled object — half the blob size and it can be
+        bulk-loaded straight into a matrix with np.frombuffer.
+        """
+        blob = None
+        if embedding is not None:
+            blob = np.asarray(embedding, dtype=np.float16).tobytes()
+
+        with self._lock:
+            self._conn.execute('''
+                INSERT INTO canned_responses (keyword, response_template, category, intent, embedding)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (keyword, response_template, category, intent, blob))
+            self._canned_cache = None  # force a rebuild on next load
+
+    def load_canned_index(self):
+        """
+        Get (canned response dicts, stored embedding matrix or None) for the
+        semantic index. Loaded from SQL once and kept resident — callers hit
+        this per lookup, not just at startup, so it must stay O(1).
+        """
+        if self._canned_cache is None:
+            meta = self.get_all_canned_responses()
+            _, matrix = self.get_embeddings_matrix()
+            self._canned_cache = (meta, matrix)
+
+        return self._canned_cache
+
+    def get_embeddings_matrix(self):
+        """
+        Load every stored canned-response embedding into one contiguous
+        (N, dim) float16 matrix. Returns (ids, matrix); matrix is None when
+        no embeddings are stored yet.
+        """
+        cursor = self._conn.cursor()
+        cursor.execute('SELECT id, embedding FROM canned_responses WHERE embedding IS NOT NULL')
+        rows = cursor.fetchall()
+
+        if not rows:
+            return [], None
+
+        ids = [r[0] for r in rows]
+        matrix = np.vstack([np.frombuffer(r[1], dtype=np.float16) for r in rows])
+        return ids, matrix
+
     def get_all_canned_responses(self):
         """Get all canned responses for indexing"""
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
+        cursor = self._conn.cursor()
         cursor.execute('SELECT id, keyword, response_template, category, intent FROM canned_responses')
         results = cursor.fetchall()
-        conn.close()
-        
+
         return [{
             'id': r[0],
             'keyword': r[1],
@@ -153,51 +264,81 @@ class Database:
             'category': r[3],
             'intent': r[4]
         } for r in results]
-    
+
+    def get_etag_cache(self, key):
+        """Get (etag, body) for a cached YouTube response, or None."""
+        cursor = self._conn.cursor()
+        cursor.execute('SELECT etag, body FROM youtube_etag_cache WHERE key = ?', (key,))
+        row = cursor.fetchone()
+        return (row[0], row[1]) if row else None
+
+    def set_etag_cache(self, key, etag, body):
+        """Store the ETag and raw body for a YouTube response."""
+        with self._lock:
+            self._conn.execute('''
+                INSERT OR REPLACE INTO youtube_etag_cache (key, etag, body, ts)
+                VALUES (?, ?, ?, ?)
+            ''', (key, etag, body, int(time.time())))
+
     def is_processed(self, post_id):
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute('SELECT id FROM processed_posts WHERE post_id = ?', (post_id,))
-        result = cursor.fetchone()
-        conn.close()
-        return result is not None
-    
-    def mark_processed(self, post_id, platform, content, author, intent, sentiment, 
+        return post_id in self._processed_ids
+
+    def load_all_processed_ids(self):
+        """
+        The live set of every processed post_id. Callers may hold a direct
+        reference for membership tests in hot loops; mark_processed keeps
+        the same set current, so the reference never goes stale.
+        """
+        return self._processed_ids
+
+    def mark_processed(self, post_id, platform, content, author, intent, sentiment,
                       confidence, response, response_type, similarity_score=0.0):
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO processed_posts 
-            (post_id, platform, content, author, intent, sentiment, confidence, 
-             processed_at, response_sent, response_type, similarity_score)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (post_id, platform, content, author, intent, sentiment, confidence,
-              datetime.now(), response, response_type, similarity_score))
-        conn.commit()
-        conn.close()
-    
+        with self._lock:
+            self._pending.append((post_id, platform, content, author, intent, sentiment,
+                                  confidence, response, response_type, similarity_score))
+            self._processed_ids.add(post_id)
+
+            # Keep the running stats in step (online mean update)
+            self._total_processed += 1
+            if response_type == 'canned':
+                self._canned_count += 1
+            elif response_type == 'ai':
+                self._ai_count += 1
+            n = self._total_processed
+            self._avg_confidence += ((confidence or 0.0) - self._avg_confidence) / n
+            self._avg_similarity += ((similarity_score or 0.0) - self._avg_similarity) / n
+
+    def flush(self):
+        """Write all buffered mark_processed rows in a single transaction."""
+        with self._lock:
+            if not self._pending:
+                return
+
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                # processed_at is supplied explicitly rather than left to the
+                # column default: CREATE TABLE IF NOT EXISTS doesn't add the
+                # DEFAULT CURRENT_TIMESTAMP to tables created by older
+                # versions, which would leave their new rows with NULL
+                self._conn.executemany('''
+                    INSERT INTO processed_posts
+                    (post_id, platform, content, author, intent, sentiment, confidence,
+                     response_sent, response_type, similarity_score, processed_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
+                ''', self._pending)
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+
+            self._pending = []
+
     def get_stats(self):
-        """Get performance statistics"""
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT 
-                COUNT(*) as total,
-                SUM(CASE WHEN response_type = 'canned' THEN 1 ELSE 0 END) as canned,
-                SUM(CASE WHEN response_type = 'ai' THEN 1 ELSE 0 END) as ai,
-                AVG(confidence) as avg_conf,
-                AVG(similarity_score) as avg_sim
-            FROM processed_posts
-        ''')
-        
-        result = cursor.fetchone()
-        conn.close()
-        
+        """Get performance statistics (in-memory counters, no table scan)"""
         return {
-            'total_processed': result[0] or 0,
-            'canned_responses': result[1] or 0,
-            'ai_responses': result[2] or 0,
-            'avg_confidence': result[3] or 0,
-            'avg_similarity': result[4] or 0
-        }
\ No newline at end of file
+            'total_processed': self._total_processed,
+            'canned_responses': self._canned_count,
+            'ai_responses': self._ai_count,
+            'avg_confidence': self._avg_confidence,
+            'avg_similarity': self._avg_similarity
+        }
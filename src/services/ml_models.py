@@ -1,81 +1,377 @@
+import functools
+import hashlib
+import math
+import os
+import pathlib
+import threading
 from transformers import pipeline, AutoTokenizer, AutoModel
 from sentence_transformers import SentenceTransformer
 import torch
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
 from config.settings import Config
 
+# Optional: ONNX Runtime backend with int8 dynamic quantization for the
+# classifier models (~4x on CPU). Falls back to eager PyTorch pipelines.
+try:
+    from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from optimum.pipelines import pipeline as ort_pipeline
+except ImportError:
+    ORTModelForSequenceClassification = None
+
+# Exported/quantized ONNX models are cached here so later runs skip the export
+_ONNX_CACHE_DIR = pathlib.Path(__file__).resolve().parents[2] / '.cache' / 'onnx'
+
+# Canned-response embedding matrices are cached here, keyed by embedding
+# model + content hash, so restarts skip re-encoding unchanged responses
+_EMB_CACHE_DIR = pathlib.Path(__file__).resolve().parents[2] / '.cache' / 'embeddings'
+
+# Optional: numba compiles the similarity kernel to native SIMD code.
+# The NumPy fallback below is already vectorized, just less fused.
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+# Optional: FAISS gives a SIMD inner-product kernel with built-in top-k.
+# The pure-NumPy path below stays as the fallback.
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+@functools.lru_cache(maxsize=None)
+def _load_tokenizer(model_name):
+    """
+    Fast (Rust) tokenizer, loaded once per model name for the whole process.
+    Pipelines sharing a backbone reuse the same tokenizer object instead of
+    re-parsing the vocab files per pipeline.
+    """
+    return AutoTokenizer.from_pretrained(model_name, use_fast=True)
+
+
+def _top_k_desc(scores, k):
+    """
+    Indices of the k largest scores, in descending score order.
+    argpartition selects the survivors in O(N), then only those k get
+    sorted — a full argsort would pay O(N log N) to pick a handful.
+    """
+    k = min(k, scores.size)
+    part = np.argpartition(-scores, k - 1)[:k]
+    return part[np.argsort(-scores[part])]
+
+
+def _cosine_sims_numpy(matrix, query):
+    """Cosine similarity of one query against every row of matrix"""
+    denom = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+    denom[denom == 0] = 1.0
+    return (matrix @ query) / denom
+
+if njit is not None:
+    # parallel=True + prange splits the row loop across cores; each row's
+    # dot/norm is independent, so the kernel scales linearly until the
+    # matrix stops fitting in cache
+    @njit(cache=True, fastmath=True, parallel=True)
+    def _cosine_sims(matrix, query):
+        n, d = matrix.shape
+        qnorm = 0.0
+        for j in range(d):
+            qnorm += query[j] * query[j]
+        qnorm = math.sqrt(qnorm)
+
+        sims = np.empty(n, dtype=np.float32)
+        for i in prange(n):
+            dot = 0.0
+            rnorm = 0.0
+            for j in range(d):
+                dot += matrix[i, j] * query[j]
+                rnorm += matrix[i, j] * matrix[i, j]
+            denom = math.sqrt(rnorm) * qnorm
+            sims[i] = dot / denom if denom > 0 else 0.0
+        return sims
+else:
+    _cosine_sims = _cosine_sims_numpy
+
 class MLModels:
+    # Below this many canned rows the fp32 scan is already trivial, so the
+    # quantized shortlist isn't built
+    QUANTIZED_SHORTLIST_MIN_ROWS = 256
+    # Above this many rows the 1-bit Hamming scan (32x smaller than fp32)
+    # takes over as the first-stage filter
+    BINARY_SHORTLIST_MIN_ROWS = 4096
+
+    # Semantic cache for intent results: a query whose embedding is within
+    # this cosine of a cached one reuses that result (query-to-query range)
+    SEMANTIC_CACHE_THRESHOLD = 0.92
+    SEMANTIC_CACHE_MAX_ENTRIES = 512
+
     def __init__(self):
-        print("Loading ML models...")
-        
-        # Intent classification (Zero-shot)
-        # use zero-shot-classification pipeline
-        self.intent_classifier = pipeline(
+        # By default torch can leave most CPU cores idle during inference;
+        # saturate them (override with ML_THREADS) and keep interop modest
+        if not torch.cuda.is_available():
+            torch.set_num_threads(int(os.environ.get('ML_THREADS', os.cpu_count() or 1)))
+            try:
+                torch.set_num_interop_threads(2)
+            except RuntimeError:
+                pass  # Can only be set once per process
+
+        # The three transformer models load lazily (cached_property below):
+        # startup pays nothing, and a process that only embeds never loads
+        # the ~1.5GB zero-shot model at all
+
+        # Cache for canned response embeddings
+        self.canned_intent_embeddings = None  # NEW: Embeddings of intents/keywords
+        self.canned_response_embeddings = None  # NEW: Embeddings of response text (backup)
+        self.canned_intent_index = None  # FAISS index over the intent embeddings (optional)
+        self.canned_intent_int8 = None   # int8 shortlist copy for large canned sets
+        self._int8_scale = None
+        self.canned_intent_bits = None   # 1-bit packed copy for very large canned sets
+        self.canned_responses = None
+
+        # Semantic cache: embeddings of already-classified texts plus their
+        # intent results, so near-duplicate wording skips the expensive
+        # zero-shot forward pass
+        self._intent_cache_embs = None
+        self._intent_cache_results = []
+        # The models are shared across the platform monitor threads; the
+        # embedding array and result list must mutate in lockstep, so both
+        # cache operations serialize on this
+        self._intent_cache_lock = threading.Lock()
+
+        print("✅ ML models ready (loaded lazily on first use)")
+
+    # Intent classification (Zero-shot)
+    # use zero-shot-classification pipeline
+    @functools.cached_property
+    def intent_classifier(self):
+        """Zero-shot intent pipeline, built on first use."""
+        print("Loading intent classifier...")
+        return self._build_classifier_pipeline(
             "zero-shot-classification",
-            model=Config.HF_INTENT_MODEL,
-            device=0 if torch.cuda.is_available() else -1
+            Config.HF_INTENT_MODEL
         )
-        
-        # Sentiment analysis
-        # use "sentiment-analysis" pipeline
-        self.sentiment_analyzer = pipeline(
+
+    # Sentiment analysis
+    # use "sentiment-analysis" pipeline
+    @functools.cached_property
+    def sentiment_analyzer(self):
+        """Sentiment pipeline, built on first use."""
+        print("Loading sentiment analyzer...")
+        return self._build_classifier_pipeline(
             "sentiment-analysis",
-            model=Config.HF_SENTIMENT_MODEL,
-            device=0 if torch.cuda.is_available() else -1
+            Config.HF_SENTIMENT_MODEL
         )
-        
-        # Sentence embeddings for semantic similarity
-        self.embedding_model = SentenceTransformer(Config.HF_EMBEDDING_MODEL)
-        
-        # Cache for canned response embeddings
-        self.canned_intent_embeddings = None  # NEW: Embeddings of intents/keywords
-        self.canned_response_embeddings = None  # NEW: Embeddings of response text (backup)
-        self.canned_responses = None    
-        
-        print("✅ ML models loaded successfully!")
-    
+
+    # Sentence embeddings for semantic similarity
+    @functools.cached_property
+    def embedding_model(self):
+        """Sentence-embedding model, built on first use."""
+        print("Loading embedding model...")
+        model = SentenceTransformer(Config.HF_EMBEDDING_MODEL)
+
+        # Halve the transformer matmul bandwidth where it's safe: fp16 on
+        # GPU, bf16 on CPU as an opt-in (only a win with native AVX512-BF16
+        # or AMX support, so it's gated behind an env flag). encode() still
+        # returns float32 numpy arrays either way, and MiniLM cosine
+        # ordering is insensitive to the precision drop.
+        if torch.cuda.is_available():
+            model = model.half().to('cuda')
+        elif os.environ.get('ML_BF16') == '1':
+            model = model.to(torch.bfloat16)
+        return model
+
+    def _build_classifier_pipeline(self, task, model_name):
+        """
+        Build a classification pipeline, preferring an int8-quantized ONNX
+        Runtime backend on CPU when optimum is installed. Any failure in the
+        ONNX path falls back to the eager PyTorch pipeline.
+        """
+        on_gpu = torch.cuda.is_available()
+
+        if ORTModelForSequenceClassification is not None and not on_gpu:
+            try:
+                quant_dir = _ONNX_CACHE_DIR / (model_name.replace('/', '__') + '-int8')
+
+                if not quant_dir.exists():
+                    # One-time export + dynamic int8 quantization, cached on
+                    # disk so later runs load directly
+                    model = ORTModelForSequenceClassification.from_pretrained(
+                        model_name, export=True
+                    )
+                    quantizer = ORTQuantizer.from_pretrained(model)
+                    quantizer.quantize(
+                        save_dir=quant_dir,
+                        quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False)
+                    )
+
+                ort_model = ORTModelForSequenceClassification.from_pretrained(quant_dir)
+                print(f"   ⚡ {task}: ONNX Runtime int8 backend")
+                return ort_pipeline(
+                    task,
+                    model=ort_model,
+                    tokenizer=_load_tokenizer(model_name),
+                    accelerator="ort"
+                )
+            except Exception as e:
+                print(f"   ⚠️ ONNX backend unavailable for {model_name}: {e}")
+
+        device = 0 if on_gpu else -1
+        tokenizer = _load_tokenizer(model_name)
+        try:
+            # SDPA gives fused attention kernels on recent torch builds
+            return pipeline(task, model=model_name, tokenizer=tokenizer,
+                            device=device,
+                            model_kwargs={'attn_implementation': 'sdpa'})
+        except Exception:
+            # Older transformers/model combos don't accept the kwarg
+            return pipeline(task, model=model_name, tokenizer=tokenizer,
+                            device=device)
+
     # does do something!
     def classify_intent(self, text):
         """Classify the intent of the message"""
+        return self.classify_intents([text])[0]
+
+    def classify_intents(self, texts, batch_size=Config.INTENT_BATCH_SIZE,
+                         query_embeddings=None):
+        """
+        Classify intents for a batch of messages.
+        Near-duplicates of already-classified texts are answered from the
+        semantic cache (one cheap embedding lookup); only genuinely new
+        texts go through the zero-shot pipeline, in one batched call.
+
+        Callers that already embedded the texts (the batch response path
+        embeds them for canned matching anyway) pass query_embeddings to
+        skip a second encoder pass over the same batch.
+        """
+        if not texts:
+            return []
+
+        results = [None] * len(texts)
+
+        # Embedding the whole batch is far cheaper than even one zero-shot
+        # forward, so the cache probe is close to free
+        query_embs = query_embeddings
+        if query_embs is None:
+            try:
+                query_embs = self.embed_texts(texts)
+            except Exception:
+                query_embs = None
+
+        miss_indices = []
+        for i in range(len(texts)):
+            hit = self._semantic_cache_lookup(query_embs[i]) if query_embs is not None else None
+            if hit is not None:
+                results[i] = hit
+            else:
+                miss_indices.append(i)
+
+        if miss_indices:
+            classified = self._classify_intents_model(
+                [texts[i] for i in miss_indices], batch_size
+            )
+            for i, result in zip(miss_indices, classified):
+                results[i] = result
+                if query_embs is not None:
+                    self._semantic_cache_store(query_embs[i], result)
+
+        return results
+
+    def _semantic_cache_lookup(self, query_emb):
+        """Return the cached intent result for a near-duplicate query, if any"""
+        with self._intent_cache_lock:
+            if self._intent_cache_embs is None:
+                return None
+
+            sims = self._intent_cache_embs @ query_emb
+            best = int(np.argmax(sims))
+            if sims[best] >= self.SEMANTIC_CACHE_THRESHOLD:
+                return self._intent_cache_results[best]
+            return None
+
+    def _semantic_cache_store(self, query_emb, result):
+        """Add a classified query to the semantic cache (FIFO bounded)"""
+        with self._intent_cache_lock:
+            if self._intent_cache_embs is None:
+                self._intent_cache_embs = query_emb.reshape(1, -1)
+                self._intent_cache_results = [result]
+                return
+
+            self._intent_cache_embs = np.vstack([self._intent_cache_embs, query_emb])
+            self._intent_cache_results.append(result)
+
+            if len(self._intent_cache_results) > self.SEMANTIC_CACHE_MAX_ENTRIES:
+                self._intent_cache_embs = self._intent_cache_embs[1:]
+                self._intent_cache_results.pop(0)
+
+    def _classify_intents_model(self, texts, batch_size):
+        """Run the zero-shot pipeline over texts (no caching)"""
         try:
             # The hugginface pipline accepts parameters of:
-            # actual text of the post
+            # the list of post texts
             # get the list of intents from config
             # can it assign multiple labels to one text
-            # It then assigns one label to the given text
-            result = self.intent_classifier(
-                text,
+            # It then assigns one label to each given text
+            results = self.intent_classifier(
+                texts,
                 candidate_labels=Config.INTENT_LABELS,
-                multi_label=False
+                multi_label=False,
+                batch_size=batch_size
             )
+            # A single-item list still comes back as one dict
+            if isinstance(results, dict):
+                results = [results]
             # gets the first element (the most accurate and only one because of multi_label)
-            return {
+            return [{
                 'intent': result['labels'][0],
                 'confidence': result['scores'][0],
                 'all_scores': dict(zip(result['labels'], result['scores']))
-            }
+            } for result in results]
         except Exception as e:
             print(f"Intent classification error: {e}")
-            return {'intent': 'general question', 'confidence': 0.5, 'all_scores': {}}
-    
+            return [{'intent': 'general question', 'confidence': 0.5, 'all_scores': {}}
+                    for _ in texts]
+
     def analyze_sentiment(self, text):
         """Analyze sentiment of the message"""
+        return self.analyze_sentiments([text])[0]
+
+    def analyze_sentiments(self, texts, batch_size=Config.SENTIMENT_BATCH_SIZE):
+        """Analyze sentiment for a batch of messages in one pipeline call"""
         try:
             # This is very similar to the intent classifier except it uses a different model and pipeline
-            result = self.sentiment_analyzer(text)[0]
-            
-            return {
+            results = self.sentiment_analyzer(texts, batch_size=batch_size)
+
+            return [{
                 'sentiment': result['label'],  # POSITIVE or NEGATIVE
                 'confidence': result['score']
-            }
+            } for result in results]
         except Exception as e:
             print(f"Sentiment analysis error: {e}")
-            return {'sentiment': 'NEUTRAL', 'confidence': 0.5}
+            return [{'sentiment': 'NEUTRAL', 'confidence': 0.5} for _ in texts]
     # this basically takes the text and converts it to a long list of numbers where text with similar meaning have similar numbers
-    def embed_text(self, text):
-        """Generate embedding for text"""
-        return self.embedding_model.encode(text, convert_to_numpy=True)
+    def embed_text(self, text, normalize=False):
+        """Generate embedding for text (optionally L2-normalized)"""
+        return self.embedding_model.encode(
+            text,
+            convert_to_numpy=True,
+            normalize_embeddings=normalize
+        )
+
+    def embed_texts(self, texts, batch_size=64, normalize=True):
+        """
+        Embed a list of texts in one batched call. SentenceTransformer sorts
+        the inputs by length internally, so batching here also minimizes the
+        padding tokens wasted per forward pass — always prefer this over
+        looping embed_text when several texts are in hand.
+        """
+        return self.embedding_model.encode(
+            texts,
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=normalize,
+            show_progress_bar=False
+        )
     
     # gets the canned responses and also their embedings
     def build_canned_response_index(self, canned_responses):
@@ -95,43 +391,143 @@ class MLModels:
             combined = f"{intent}, {keyword}, {category}".strip(', ')
             intent_texts.append(combined)
     
-        self.canned_intent_embeddings = self.embedding_model.encode(
-            intent_texts, 
-            convert_to_numpy=True
-        )
+        # L2-normalize at build time so per-query cosine similarity is a
+        # single matvec against this matrix with no renormalization pass.
+        # The matrix is cached on disk keyed by (embedding model, content):
+        # a restart with unchanged canned responses loads it back with
+        # np.load instead of paying the transformer forward pass again,
+        # and any edit or model swap changes the key so nothing stale loads.
+        key = hashlib.sha256(
+            (Config.HF_EMBEDDING_MODEL + '\n'.join(intent_texts)).encode()
+        ).hexdigest()
+        cache_file = _EMB_CACHE_DIR / f'emb_{key}.npy'
+
+        emb = None
+        if cache_file.exists():
+            try:
+                emb = np.load(cache_file)
+            except Exception:
+                emb = None  # Corrupt/truncated cache file — re-encode
+
+        if emb is None:
+            emb = self.embed_texts(intent_texts)
+            try:
+                _EMB_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                np.save(cache_file, emb)
+            except OSError:
+                pass  # Read-only filesystem — cache is best-effort
+
+        self.canned_intent_embeddings = np.ascontiguousarray(emb, dtype=np.float32)
+
+        # Persistent FAISS index built once; vectors are already normalized
+        # so inner product == cosine
+        self.canned_intent_index = None
+        if faiss is not None and len(self.canned_intent_embeddings):
+            index = faiss.IndexFlatIP(self.canned_intent_embeddings.shape[1])
+            index.add(self.canned_intent_embeddings)
+            self.canned_intent_index = index
+
+        # Int8 scalar-quantized copy for shortlist scans on big canned sets:
+        # 4x fewer bytes touched per query. Candidates are always rescored
+        # against the fp32 matrix, so reported similarities are unaffected.
+        self.canned_intent_int8 = None
+        self._int8_scale = None
+        if len(self.canned_intent_embeddings) >= self.QUANTIZED_SHORTLIST_MIN_ROWS:
+            scale = np.abs(self.canned_intent_embeddings).max() / 127.0
+            if scale > 0:
+                self.canned_intent_int8 = np.round(
+                    self.canned_intent_embeddings / scale
+                ).astype(np.int8)
+                self._int8_scale = scale
+
+        # 1-bit binary copy (sign of each dim, packed 8 dims/byte). On
+        # normalized vectors Hamming distance preserves cosine ordering well
+        # enough for candidate selection; the fp32 rerank recovers precision.
+        self.canned_intent_bits = None
+        if len(self.canned_intent_embeddings) >= self.BINARY_SHORTLIST_MIN_ROWS:
+            self.canned_intent_bits = np.packbits(
+                self.canned_intent_embeddings > 0, axis=1
+            )
     
-    def find_similar_response(self, query_text, top_k=3, use_intent_matching=True):
-        """Find most similar canned response"""
+    def find_similar_response(self, query_text, top_k=3, use_intent_matching=True,
+                              query_embedding=None):
+        """
+        Find most similar canned response. Callers that already embedded the
+        query (e.g. as part of a batched encode) pass query_embedding to
+        skip the single-sample forward pass here.
+        """
         if self.canned_intent_embeddings is None:
             return None, 0.0
-        
-        # Embed the customer's query
-        query_embedding = self.embed_text(query_text)
-        
+
+        # Embed the customer's query unless a precomputed (normalized)
+        # embedding was handed in
+        if query_embedding is None:
+            query_embedding = self.embed_text(query_text, normalize=True)
+        query_embedding = np.ascontiguousarray(query_embedding, dtype=np.float32)
+
         # Choose which embeddings to compare against
         if use_intent_matching and self.canned_intent_embeddings is not None:
-            # IMPROVED: Compare against intent/keyword embeddings
-            target_embeddings = self.canned_intent_embeddings
+            # IMPROVED: Compare against intent/keyword embeddings.
+            # Both sides are pre-normalized, so cosine is one inner product.
             match_type = "intent"
+            k = min(top_k, len(self.canned_intent_embeddings))
+
+            if self.canned_intent_index is not None:
+                # FAISS returns the top-k directly, no Python-side argsort
+                sims, idxs = self.canned_intent_index.search(
+                    query_embedding.reshape(1, -1), k
+                )
+                top_pairs = list(zip(idxs[0], sims[0]))
+            elif self.canned_intent_bits is not None:
+                # Hamming scan over the packed bits picks candidates, fp32
+                # rerank of just those rows gives the final scores
+                q_bits = np.packbits(query_embedding > 0)
+                xor = self.canned_intent_bits ^ q_bits
+                hamming = np.unpackbits(xor, axis=1).sum(axis=1)
+
+                n_short = min(len(hamming), max(4 * k, 32))
+                shortlist = np.argpartition(hamming, n_short - 1)[:n_short]
+
+                sims_short = self.canned_intent_embeddings[shortlist] @ query_embedding
+                order = _top_k_desc(sims_short, k)
+                top_pairs = [(shortlist[i], sims_short[i]) for i in order]
+            elif self.canned_intent_int8 is not None:
+                # Cheap int8 scan picks a candidate set, fp32 rescoring of
+                # just those rows produces the final scores.
+                # int32 accumulation: an int8 @ int8 product would overflow.
+                # The scale is calibrated on the corpus max, so a query
+                # component above it would wrap negative in the int8 cast
+                # and flip the sign of its dot-product term — clamp first.
+                q_i8 = np.clip(np.round(query_embedding / self._int8_scale),
+                               -127, 127).astype(np.int8)
+                approx = self.canned_intent_int8.astype(np.int32) @ q_i8.astype(np.int32)
+
+                n_short = min(len(approx), max(4 * k, 32))
+                shortlist = np.argpartition(-approx, n_short - 1)[:n_short]
+
+                sims_short = self.canned_intent_embeddings[shortlist] @ query_embedding
+                order = _top_k_desc(sims_short, k)
+                top_pairs = [(shortlist[i], sims_short[i]) for i in order]
+            else:
+                similarities = self.canned_intent_embeddings @ query_embedding
+                top_indices = _top_k_desc(similarities, k)
+                top_pairs = [(idx, similarities[idx]) for idx in top_indices]
         else:
             # ORIGINAL: Compare against response text embeddings
-            target_embeddings = self.canned_response_embeddings
+            # (loaded from the DB, not guaranteed normalized)
             match_type = "response"
-        
-        # Calculate cosine similarities
-        similarities = cosine_similarity(
-            query_embedding.reshape(1, -1),
-            target_embeddings
-        )[0]
-        
-        # Get top matches
-        top_indices = np.argsort(similarities)[-top_k:][::-1]
-        
+            similarities = _cosine_sims(
+                np.ascontiguousarray(self.canned_response_embeddings, dtype=np.float32),
+                query_embedding
+            )
+            top_indices = _top_k_desc(similarities, top_k)
+            top_pairs = [(idx, similarities[idx]) for idx in top_indices]
+
         results = []
-        for idx in top_indices:
+        for idx, sim in top_pairs:
             results.append({
                 'response': self.canned_responses[idx],
-                'similarity': similarities[idx],
+                'similarity': sim,
                 'match_type': match_type
             })
         
@@ -1,5 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional, Tuple
+from functools import partial
+from typing import List, Dict, Optional
+from core.interaction import reviewer
+from core.keyword_matcher import KeywordMatcher
 
 class BaseMonitor(ABC):
     """
@@ -20,6 +23,18 @@ class BaseMonitor(ABC):
         self.db = db
         self.response_gen = response_generator
         self.platform_name = self.get_platform_name()
+        # Keywords are static for the process, so compile the matcher once
+        # here instead of re-deriving filters inside the hot loops
+        self.keyword_matcher = KeywordMatcher(self.get_monitor_keywords())
+        # Shared reference to the database's live seen-set: one bulk hydrate
+        # at startup, then pure set membership in the per-mention loop (the
+        # DB keeps it current as posts are marked processed)
+        self._seen = self.db.load_all_processed_ids()
+        # Mentions queued for interactive review but not yet answered.
+        # Polling monitors re-find the same post every cycle; without this
+        # the user would get a duplicate prompt (and could double-post)
+        # for anything they haven't reviewed yet
+        self._pending_review = set()
 
     @abstractmethod
     def get_platform_name(self) -> str:
@@ -97,81 +112,78 @@ class BaseMonitor(ABC):
         processed_count = 0
         keywords = self.get_monitor_keywords()
 
-        for keyword in keywords:
-            print(f"\n🔎 Searching for: '{keyword}'")
-
-            try:
-                mentions = self.search_mentions([keyword])
-
-                for mention in mentions:
-                    post_id = f"{self.platform_name}_{mention['id']}"
-
-                    # Skip if already processed
-                    if self.db.is_processed(post_id):
-                        continue
-
-                    # Skip if it's your own post (if author info available)
-                    if self._is_own_post(mention):
-                        continue
-
-                    print(f"\n📬 New {self.platform_name} post by {mention.get('author', 'Unknown')}")
-                    print(f"   Content: {mention['content'][:100]}...")
-
-                    # Generate response
-                    response_data = self.response_gen.generate_response(mention['content'])
-
-                    print(f"   💬 Response ({response_data['type']}): {response_data['text'][:80]}...")
-
-                    # Post reply
-                    try:
-                        # Optional: Allow user to modify response
-                        if self.config.INTERACTIVE_MODE if hasattr(self.config, 'INTERACTIVE_MODE') else False:
-                            user_input = input("Modify this reply? (y/n/skip): ")
-                            if user_input == "y":
-                                response_data['text'] = input("Enter response: ")
-                            elif user_input == "skip":
-                                continue
-
-                        success = self.post_reply(mention['id'], response_data['text'])
-
-                        if success:
-                            print("   ✅ Reply posted!")
-
-                            self.db.mark_processed(
-                                post_id,
-                                self.platform_name,
-                                mention['content'],
-                                mention.get('author', 'Unknown'),
-                                response_data['intent'],
-                                response_data['sentiment'],
-                                response_data['confidence'],
-                                response_data['text'],
-                                response_data['type'],
-                                response_data['similarity_score']
-                            )
-
-                            processed_count += 1
-                        else:
-                            print("   ❌ Failed to post reply")
-
-                    except Exception as e:
-                        print(f"   ❌ Failed to post: {e}")
-                        # Mark as processed to avoid retry loops
-                        self.db.mark_processed(
-                            post_id,
-                            self.platform_name,
-                            mention['content'],
-                            mention.get('author', 'Unknown'),
-                            response_data['intent'],
-                            response_data['sentiment'],
-                            response_data['confidence'],
-                            f"FAILED: {str(e)}",
-                            'failed',
-                            response_data['similarity_score']
-                        )
-
-            except Exception as e:
-                print(f"❌ Error searching for '{keyword}': {e}")
+        # Phase 1: collect every new mention, applying only the cheap
+        # filters. One call with the full keyword list: the monitors either
+        # fan the keywords out themselves (YouTube's thread pool, which also
+        # dedupes videos surfaced by several keywords) or drain a stream
+        # that covers every keyword at once (Reddit, Mastodon) — calling
+        # once per keyword would defeat both.
+        candidates = []
+        candidate_ids = set()
+
+        print(f"\n🔎 Searching for: {', '.join(repr(k) for k in keywords)}")
+
+        try:
+            mentions = self.search_mentions(keywords)
+        except Exception as e:
+            print(f"❌ Error searching {self.platform_name}: {e}")
+            mentions = []
+
+        for mention in mentions:
+            post_id = f"{self.platform_name}_{mention['id']}"
+
+            # Skip if already processed, queued twice this cycle, or
+            # still awaiting interactive review — plain set lookups,
+            # no DB call in the loop
+            if (post_id in candidate_ids or post_id in self._seen
+                    or post_id in self._pending_review):
+                continue
+
+            # Skip if it's your own post (if author info available)
+            if self._is_own_post(mention):
+                continue
+
+            candidate_ids.add(post_id)
+            candidates.append((post_id, mention))
+
+        # Phase 2: one batched ML pass over the whole cycle's mentions
+        responses = []
+        if candidates:
+            print(f"\n🧠 Generating responses for {len(candidates)} new mention(s)...")
+            responses = self.response_gen.generate_responses_batch(
+                [mention['content'] for _, mention in candidates]
+            )
+
+        # Phase 3: review and post the replies
+        interactive = getattr(self.config, 'INTERACTIVE_MODE', False)
+        queued_count = 0
+
+        for (post_id, mention), response_data in zip(candidates, responses):
+            print(f"\n📬 New {self.platform_name} post by {mention.get('author', 'Unknown')}")
+            print(f"   Content: {mention['content'][:100]}...")
+            print(f"   💬 Response ({response_data['type']}): {response_data['text'][:80]}...")
+
+            if interactive:
+                # Hand the reply to the review thread instead of blocking the
+                # whole monitoring cycle on input(); track it as pending so
+                # later cycles don't queue the same mention again
+                self._pending_review.add(post_id)
+                reviewer.submit(
+                    f"{self.platform_name} post by {mention.get('author', 'Unknown')}",
+                    response_data['text'],
+                    on_approved=partial(self._review_approved, post_id, mention, response_data),
+                    on_skipped=partial(self._pending_review.discard, post_id)
+                )
+                queued_count += 1
+            else:
+                if self._post_and_record(post_id, mention, response_data, response_data['text']):
+                    processed_count += 1
+
+        if queued_count:
+            print(f"\n⏳ {queued_count} repl(ies) queued for interactive review")
+
+        # One transaction for the whole cycle's writes
+        self.db.flush()
 
         if processed_count == 0:
             print(f"\nℹ️  No new mentions found on {self.platform_name}")
@@ -180,6 +192,66 @@ class BaseMonitor(ABC):
 
         return processed_count
 
+    def _review_approved(self, post_id: str, mention: Dict, response_data: Dict,
+                         reply_text: str) -> bool:
+        """
+        Approval callback for the interactive reviewer: the mention is no
+        longer pending (posting marks it processed, so it won't be queued
+        again either way).
+        """
+        self._pending_review.discard(post_id)
+        return self._post_and_record(post_id, mention, response_data, reply_text)
+
+    def _post_and_record(self, post_id: str, mention: Dict, response_data: Dict,
+                         reply_text: str) -> bool:
+        """
+        Post a single reply and record it in the database.
+        Used directly in automated mode and as the approval callback in
+        interactive mode.
+
+        Returns:
+            bool: True if the reply was posted successfully
+        """
+        try:
+            success = self.post_reply(mention['id'], reply_text)
+
+            if success:
+                print("   ✅ Reply posted!")
+
+                self.db.mark_processed(
+                    post_id,
+                    self.platform_name,
+                    mention['content'],
+                    mention.get('author', 'Unknown'),
+                    response_data['intent'],
+                    response_data['sentiment'],
+                    response_data['confidence'],
+                    reply_text,
+                    response_data['type'],
+                    response_data['similarity_score']
+                )
+                return True
+
+            print("   ❌ Failed to post reply")
+            return False
+
+        except Exception as e:
+            print(f"   ❌ Failed to post: {e}")
+            # Mark as processed to avoid retry loops
+            self.db.mark_processed(
+                post_id,
+                self.platform_name,
+                mention['content'],
+                mention.get('author', 'Unknown'),
+                response_data['intent'],
+                response_data['sentiment'],
+                response_data['confidence'],
+                f"FAILED: {str(e)}",
+                'failed',
+                response_data['similarity_score']
+            )
+            return False
+
     def _is_own_post(self, mention: Dict) -> bool:
         """
         Check if the mention is from the bot's own account.
@@ -8,9 +8,24 @@ class RedditMonitor(BaseMonitor):
     Monitors Reddit for keyword mentions and replies to posts/comments.
     """
 
+    # Self-posts can run to tens of KB; everything downstream (keyword
+    # check, embedding, reply context) only ever looks at the opening of
+    # the post, so cap the copied text here instead of hauling the whole
+    # body through every mention dict
+    MAX_CONTENT = 2048
+
+    # Max items pulled from the streams per cycle. On r/all new comments
+    # arrive faster than the stream's 100-per-fetch page, so pause_after=0
+    # never yields None and an unbounded drain would spin here forever,
+    # stalling every other platform in the gather. Mirrors Mastodon's
+    # STREAM_DRAIN_BUDGET.
+    STREAM_DRAIN_BUDGET = 500
+
     def __init__(self, config, db, response_generator):
         super().__init__(config, db, response_generator)
         self.reddit = None
+        self._submission_stream = None
+        self._comment_stream = None
 
     def get_platform_name(self) -> str:
         return 'reddit'
@@ -29,22 +44,49 @@ class RedditMonitor(BaseMonitor):
             # Test connection
             username = self.reddit.user.me()
             print(f"✅ Connected to Reddit as u/{username}")
+
+            self._open_streams()
             return True
 
         except Exception as e:
             print(f"❌ Failed to connect to Reddit: {e}")
             return False
 
+    def _open_streams(self):
+        """
+        (Re)create the submission and comment streams. Streams push only
+        items created after this point; pause_after=0 makes them
+        non-blocking so each cycle just drains what's new instead of
+        re-running the same search and paging through results we've
+        already seen. Also called after a stream error, since a generator
+        that raised is permanently exhausted.
+        """
+        subreddit = self.reddit.subreddit('all')
+        self._submission_stream = subreddit.stream.submissions(
+            skip_existing=True, pause_after=0
+        )
+        self._comment_stream = subreddit.stream.comments(
+            skip_existing=True, pause_after=0
+        )
+
     def get_monitor_keywords(self) -> List[str]:
         """Get Reddit-specific keywords from config."""
         return self.config.MONITOR_KEYWORDS
 
     def search_mentions(self, keywords: List[str]) -> List[Dict]:
         """
-        Search Reddit for posts and comments containing keywords.
+        Drain new posts and comments from the Reddit streams and keep the
+        ones matching any monitored keyword.
+
+        The streams push only items created since the last drain, so unlike
+        the old subreddit.search() polling there is nothing already-seen to
+        page through. One drain covers every keyword at once (the compiled
+        matcher holds the full keyword set), so extra per-keyword calls in
+        the same cycle simply find the streams empty.
 
         Args:
-            keywords: List of keywords to search for
+            keywords: List of keywords to search for (informational; the
+                precompiled matcher does the actual filtering)
 
         Returns:
             List of mention dictionaries
@@ -53,14 +95,21 @@ class RedditMonitor(BaseMonitor):
             raise Exception("Reddit not authenticated. Call authenticate() first.")
 
         mentions = []
-        subreddit = self.reddit.subreddit('all')
-
-        for keyword in keywords:
-            try:
-                # Search posts
-                for submission in subreddit.search(keyword, limit=10):
-                    full_text = f"{submission.title}. {submission.selftext}"
+        budget = self.STREAM_DRAIN_BUDGET
 
+        try:
+            # New submissions since the last cycle (None = stream drained,
+            # budget hit = stop and pick up the rest next cycle — on r/all
+            # the comment stream alone can outpace any single drain)
+            for submission in self._submission_stream:
+                if submission is None:
+                    break
+                budget -= 1
+
+                # Slice selftext before the concat so a 40KB body never gets
+                # copied; the embedding model truncates far below this anyway
+                full_text = f"{submission.title}. {submission.selftext[:self.MAX_CONTENT]}"
+                if self.keyword_matcher.matches(full_text):
                     mentions.append({
                         'id': f"post_{submission.id}",
                         'author': str(submission.author),
@@ -68,27 +117,40 @@ class RedditMonitor(BaseMonitor):
                         'url': f"https://reddit.com{submission.permalink}",
                         'type': 'post',
                         'subreddit': str(submission.subreddit),
-                        'title': submission.title,
-                        '_raw_object': submission  # Store for reply functionality
+                        'title': submission.title
                     })
 
-                # Search comments
-                for comment in subreddit.comments(limit=20):
-                    if not any(kw.lower() in comment.body.lower() for kw in keywords):
-                        continue
+                if budget <= 0:
+                    break
+
+            # New comments since the last cycle
+            for comment in self._comment_stream:
+                if comment is None:
+                    break
+                budget -= 1
 
+                if self.keyword_matcher.matches(comment.body):
                     mentions.append({
                         'id': f"comment_{comment.id}",
                         'author': str(comment.author),
                         'content': comment.body,
                         'url': f"https://reddit.com{comment.permalink}",
                         'type': 'comment',
-                        'subreddit': str(comment.subreddit),
-                        '_raw_object': comment
+                        'subreddit': str(comment.subreddit)
                     })
 
-            except Exception as e:
-                print(f"Error searching Reddit for '{keyword}': {e}")
+                if budget <= 0:
+                    break
+
+        except Exception as e:
+            print(f"Error reading Reddit streams: {e}")
+            # A generator that raised is exhausted for good — rebuild both
+            # streams so the next cycle keeps monitoring instead of silently
+            # iterating dead generators forever
+            try:
+                self._open_streams()
+            except Exception as reopen_err:
+                print(f"Error reopening Reddit streams: {reopen_err}")
 
         return mentions
 
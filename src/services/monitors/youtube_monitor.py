@@ -1,8 +1,38 @@
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+import requests
+from core.quota import TokenBucket, QuotaExhausted
 from services.monitors.base_monitor import BaseMonitor
 
+# Rust-based JSON parser, ~3x faster decode on big comment payloads. It
+# consumes the raw response bytes directly, skipping the UTF-8 .text pass.
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# YouTube Data API v3 base URL for the direct (non-discovery) calls
+_API_BASE = 'https://www.googleapis.com/youtube/v3'
+
+# %-formatting against a constant template is the cheapest two-substitution
+# path CPython has; the f-string equivalent builds a fresh format op per
+# mention in the hot loop
+_URL_TPL = 'https://www.youtube.com/watch?v=%s&lc=%s'
+
+# Published per-endpoint quota costs against the 10k units/day budget
+_COST_SEARCH = 100
+_COST_LIST = 1
+
+# One bucket per process: all monitor instances draw on the same daily quota
+_QUOTA_BUCKET = TokenBucket(capacity=10_000, window_seconds=86_400)
+
+# 403 reasons that mean "stop calling, the quota is gone"
+_QUOTA_REASONS = ('quotaExceeded', 'dailyLimitExceeded', 'rateLimitExceeded',
+                  'userRateLimitExceeded')
+
 class YouTubeMonitor(BaseMonitor):
     """
     YouTube platform monitor using YouTube Data API v3.
@@ -10,16 +40,40 @@ class YouTubeMonitor(BaseMonitor):
     """
 
     def __init__(self, config, db, response_generator):
+        # Bind the config lookups once (before super().__init__, which calls
+        # get_monitor_keywords during setup) instead of paying hasattr's
+        # try/except-getattr machinery per call — _is_own_post runs per
+        # mention in the base-class filter loop
+        self._yt_keywords = getattr(config, 'YOUTUBE_KEYWORDS', None) or config.MONITOR_KEYWORDS
+        self._own_channel = getattr(config, 'YOUTUBE_CHANNEL_NAME', None) or None
+
         super().__init__(config, db, response_generator)
-        self.youtube = None
+        # Pooled session for all API calls: connections stay alive across
+        # fetches, so repeat calls skip the TCP + TLS handshakes
+        self._http = requests.Session()
+        # Pin compression explicitly: comment JSON shrinks 5-10x under gzip
+        # and the fetches are network-bound (requests decompresses
+        # transparently, so the parsers never see the difference)
+        self._http.headers.update({'Accept-Encoding': 'gzip, deflate'})
+        # One alternation pattern over all keywords: the regex engine walks
+        # each comment once with C-level case folding, so no lowered copy of
+        # the text is ever allocated — O(N) scans total instead of O(N x K)
+        # string copies across comments and keywords
+        monitor_keywords = self.get_monitor_keywords()
+        self._kw_re = re.compile(
+            '|'.join(map(re.escape, monitor_keywords)), re.IGNORECASE
+        ) if monitor_keywords else None
 
     def get_platform_name(self) -> str:
         return 'youtube'
 
     def authenticate(self) -> bool:
-        """Authenticate with YouTube Data API using API key."""
+        """Validate the YouTube Data API key with one cheap probe call."""
         try:
-            self.youtube = build('youtube', 'v3', developerKey=self.config.YOUTUBE_API_KEY)
+            # The three endpoints used are called directly over the session,
+            # so there is no ~300KB discovery document to download and
+            # reflect into dynamic method objects — just confirm the key
+            self._get_json('i18nLanguages', part='snippet', fields='etag')
             print(f"✅ Connected to YouTube Data API")
             return True
 
@@ -29,7 +83,7 @@ class YouTubeMonitor(BaseMonitor):
 
     def get_monitor_keywords(self) -> List[str]:
         """Get YouTube-specific keywords from config."""
-        return self.config.YOUTUBE_KEYWORDS if hasattr(self.config, 'YOUTUBE_KEYWORDS') else self.config.MONITOR_KEYWORDS
+        return self._yt_keywords
 
     def search_mentions(self, keywords: List[str]) -> List[Dict]:
         """
@@ -44,151 +98,286 @@ class YouTubeMonitor(BaseMonitor):
         Returns:
             List of comment dictionaries
         """
-        if not self.youtube:
+        if not self.config.YOUTUBE_API_KEY:
             raise Exception("YouTube not authenticated. Call authenticate() first.")
 
         mentions = []
 
-        for keyword in keywords:
+        def search_keyword(keyword):
             try:
-                # First, search for videos related to the keyword
-                video_search = self.youtube.search().list(
+                # Search for videos related to the keyword.
+                # search.list is the expensive endpoint (100 units vs 1).
+                return self._get_json(
+                    'search',
+                    cost=_COST_SEARCH,
                     q=keyword,
                     part='id,snippet',
                     maxResults=5,  # Limit to save quota
                     type='video',
-                    order='date'  # Get recent videos
-                ).execute()
-
-                # For each video, get comments
-                for item in video_search.get('items', []):
-                    video_id = item['id']['videoId']
-                    video_title = item['snippet']['title']
+                    order='date',  # Get recent videos
+                    # Only the id and title are consumed downstream; trimming
+                    # the rest of the snippet cuts most of the response bytes
+                    fields='items(id/videoId,snippet/title)'
+                )
+            except QuotaExhausted:
+                # Retrying a spent quota just burns the next refill;
+                # let the typed error stop the cycle cleanly
+                raise
+            except Exception as e:
+                print(f"Error searching YouTube for '{keyword}': {e}")
+            return None
 
-                    # Get comments for this video
-                    comments = self._get_video_comments(video_id, keyword)
+        # Every call here is a blocking HTTPS round-trip, so fan them out:
+        # all keyword searches first, then every video's comment fetch. The
+        # cycle costs roughly two round-trip latencies instead of
+        # keywords x (1 + videos) serial ones.
+        try:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                search_results = list(executor.map(search_keyword, keywords))
+
+                # Overlapping keywords surface the same videos; dedupe before
+                # fetching so each video's comments are downloaded and parsed
+                # once (the pattern filter matches every keyword anyway)
+                video_map = {}
+                for result in search_results:
+                    if not result:
+                        continue
+                    for item in result.get('items', []):
+                        video_map.setdefault(item['id']['videoId'], item['snippet']['title'])
+
+                comment_jobs = [
+                    (video_id, video_title,
+                     executor.submit(self._get_video_comments, video_id, self._kw_re))
+                    for video_id, video_title in video_map.items()
+                ]
+
+                for video_id, video_title, future in comment_jobs:
+                    try:
+                        comments = future.result()
+                    except QuotaExhausted:
+                        raise
+                    except Exception as e:
+                        print(f"Error getting comments for video {video_id}: {e}")
+                        continue
 
                     for comment in comments:
                         mentions.append({
                             'id': comment['id'],
                             'author': comment['author'],
                             'content': comment['text'],
-                            'url': f"https://www.youtube.com/watch?v={video_id}&lc={comment['id']}",
+                            'url': _URL_TPL % (video_id, comment['id']),
                             'video_id': video_id,
                             'video_title': video_title,
                             'parent_id': comment.get('parent_id'),
                             'type': 'comment'
                         })
 
-            except HttpError as e:
-                print(f"YouTube API error searching for '{keyword}': {e}")
-            except Exception as e:
-                print(f"Error searching YouTube for '{keyword}': {e}")
+        except QuotaExhausted as e:
+            # Quota is spent for now: sit this cycle out and keep whatever
+            # was collected before the budget ran dry. The tokens refill
+            # continuously, so a later cycle resumes on its own.
+            print(f"   ⏭️ {e} — skipping YouTube for this cycle")
 
         return mentions
 
-    def _get_video_comments(self, video_id: str, keyword: str = None, max_results: int = 20) -> List[Dict]:
+    @staticmethod
+    def _quota_reason(content) -> str:
+        """Extract a quota-related 403 reason from an error body, if any."""
+        try:
+            reason = json.loads(content)['error']['errors'][0]['reason']
+        except Exception:
+            return ''
+        return reason if reason in _QUOTA_REASONS else ''
+
+    def _get_json(self, endpoint: str, cache_key: str = None, cost: int = _COST_LIST,
+                  **params) -> Dict:
+        """
+        GET a Data API endpoint through the pooled session, revalidating
+        against the ETag cache persisted in SQLite. An unchanged resource
+        answers with HTTP 304 — no body downloaded, nothing to parse — and
+        the cached JSON is replayed instead. Every call first takes its
+        quota cost from the shared token bucket; a quota-related 403
+        raises QuotaExhausted instead of being retried next cycle.
+
+        The acquire is non-blocking: the monitors share one thread pool and
+        event loop with the other platforms, so an empty bucket skips the
+        call (the caller sits the cycle out) rather than sleeping a shared
+        thread until tokens refill.
+        """
+        if not _QUOTA_BUCKET.acquire(cost, block=False):
+            raise QuotaExhausted(
+                f"YouTube quota budget spent (need {cost} units); deferring to a later cycle"
+            )
+
+        headers = {}
+        cached = self.db.get_etag_cache(cache_key) if cache_key else None
+        if cached and cached[0]:
+            headers['If-None-Match'] = cached[0]
+
+        params['key'] = self.config.YOUTUBE_API_KEY
+        resp = self._http.get(f'{_API_BASE}/{endpoint}', params=params,
+                              headers=headers, timeout=10)
+
+        if resp.status_code == 304 and cached:
+            return _json_loads(cached[1])
+
+        if resp.status_code == 403:
+            reason = self._quota_reason(resp.content)
+            if reason:
+                # Sync the local bucket with the server's verdict: after a
+                # process restart the bucket starts full again, so without
+                # this every cycle would burn a round-trip on a certain 403
+                _QUOTA_BUCKET.drain()
+                raise QuotaExhausted(f"YouTube quota exhausted ({reason})")
+
+        resp.raise_for_status()
+        data = _json_loads(resp.content)
+
+        etag = resp.headers.get('ETag') or data.get('etag')
+        if cache_key and etag:
+            self.db.set_etag_cache(cache_key, etag, resp.content)
+
+        return data
+
+    def _get_video_comments(self, video_id: str, pattern: 're.Pattern' = None, max_results: int = 20) -> List[Dict]:
+        """
+        Materialized wrapper around _iter_video_comments, used where the
+        whole list is needed at once (e.g. futures running on the pool —
+        a bare generator would defer all the I/O to the consuming thread).
         """
-        Get comments from a specific video, optionally filtering by keyword.
+        return list(self._iter_video_comments(video_id, pattern, max_results))
+
+    def _iter_video_comments(self, video_id: str, pattern: 're.Pattern' = None, max_results: int = 20):
+        """
+        Yield comments from a specific video, optionally filtering by a
+        precompiled keyword pattern. Replies stream through the same
+        generator with parent_id set at yield time — no interim lists, no
+        post-loop dict mutation.
 
         Args:
             video_id: YouTube video ID
-            keyword: Optional keyword to filter comments
+            pattern: Optional compiled regex to filter comments (None = keep all)
             max_results: Maximum number of comments to retrieve
 
-        Returns:
-            List of comment dictionaries
+        Yields:
+            Comment dictionaries
         """
-        comments = []
-
         try:
             # Get top-level comments
-            request = self.youtube.commentThreads().list(
-                part='snippet',
+            response = self._get_json(
+                'commentThreads',
+                cache_key=f'{video_id}:{max_results}:time',
+                # snippet,replies returns up to 5 replies inline at the same
+                # 1-unit cost, covering the common case without the second
+                # round-trip per threaded comment
+                part='snippet,replies',
                 videoId=video_id,
                 maxResults=max_results,
                 textFormat='plainText',
-                order='time'  # Get most recent first
+                order='time',  # Get most recent first
+                # Ask only for the fields the parser below reads (plus etag
+                # for the conditional-GET cache): far less JSON on the wire
+                fields='etag,items(snippet(topLevelComment(id,snippet('
+                       'authorDisplayName,textDisplay,likeCount,publishedAt'
+                       ')),totalReplyCount),replies/comments(id,snippet('
+                       'authorDisplayName,textDisplay,likeCount,publishedAt)))'
             )
 
-            response = request.execute()
-
             for item in response.get('items', []):
                 top_comment = item['snippet']['topLevelComment']['snippet']
                 comment_id = item['snippet']['topLevelComment']['id']
                 comment_text = top_comment['textDisplay']
 
-                # Filter by keyword if provided
-                if keyword and keyword.lower() not in comment_text.lower():
+                # Filter by keyword pattern if provided
+                if pattern and not pattern.search(comment_text):
                     continue
 
-                comments.append({
+                yield {
                     'id': comment_id,
                     'author': top_comment['authorDisplayName'],
                     'text': comment_text,
                     'likes': top_comment.get('likeCount', 0),
                     'published_at': top_comment['publishedAt']
-                })
+                }
 
                 # Check replies to this comment
-                if item['snippet']['totalReplyCount'] > 0:
-                    replies = self._get_comment_replies(comment_id, keyword)
-                    for reply in replies:
-                        reply['parent_id'] = comment_id
-                        comments.append(reply)
-
-        except HttpError as e:
+                inline_replies = item.get('replies', {}).get('comments', [])
+                total_replies = item['snippet']['totalReplyCount']
+
+                if total_replies > len(inline_replies):
+                    # More replies exist than came inline — fetch the full
+                    # list (using the inline subset too would duplicate it)
+                    yield from self._iter_comment_replies(comment_id, pattern)
+                else:
+                    # The inline batch is complete; no second round-trip
+                    for reply_item in inline_replies:
+                        reply_text = reply_item['snippet']['textDisplay']
+
+                        if pattern and not pattern.search(reply_text):
+                            continue
+
+                        yield {
+                            'id': reply_item['id'],
+                            'author': reply_item['snippet']['authorDisplayName'],
+                            'text': reply_text,
+                            'likes': reply_item['snippet'].get('likeCount', 0),
+                            'published_at': reply_item['snippet']['publishedAt'],
+                            'parent_id': comment_id
+                        }
+
+        except requests.HTTPError as e:
             # Comments might be disabled for the video
-            if e.resp.status == 403:
+            if e.response.status_code == 403:
                 print(f"   ⚠️ Comments disabled for video {video_id}")
             else:
                 print(f"   ❌ Error getting comments for video {video_id}: {e}")
 
-        return comments
-
-    def _get_comment_replies(self, parent_id: str, keyword: str = None) -> List[Dict]:
+    def _iter_comment_replies(self, parent_id: str, pattern: 're.Pattern' = None):
         """
-        Get replies to a specific comment.
+        Yield replies to a specific comment, parent_id already attached.
 
         Args:
             parent_id: The parent comment ID
-            keyword: Optional keyword to filter replies
+            pattern: Optional compiled regex to filter replies (None = keep all)
 
-        Returns:
-            List of reply dictionaries
+        Yields:
+            Reply dictionaries
         """
-        replies = []
-
         try:
-            request = self.youtube.comments().list(
+            response = self._get_json(
+                'comments',
+                cache_key=f'replies:{parent_id}',
                 part='snippet',
                 parentId=parent_id,
                 maxResults=10,
-                textFormat='plainText'
+                textFormat='plainText',
+                fields='etag,items(id,snippet(authorDisplayName,textDisplay,'
+                       'likeCount,publishedAt))'
             )
 
-            response = request.execute()
-
             for item in response.get('items', []):
                 reply_text = item['snippet']['textDisplay']
 
-                # Filter by keyword if provided
-                if keyword and keyword.lower() not in reply_text.lower():
+                # Filter by keyword pattern if provided
+                if pattern and not pattern.search(reply_text):
                     continue
 
-                replies.append({
+                yield {
                     'id': item['id'],
                     'author': item['snippet']['authorDisplayName'],
                     'text': reply_text,
                     'likes': item['snippet'].get('likeCount', 0),
-                    'published_at': item['snippet']['publishedAt']
-                })
-
+                    'published_at': item['snippet']['publishedAt'],
+                    'parent_id': parent_id
+                }
+
+        except QuotaExhausted:
+            # Spent quota must abort the cycle (search_mentions handles it),
+            # not degrade into one error line per threaded comment
+            raise
         except Exception as e:
             print(f"Error getting replies for comment {parent_id}: {e}")
 
-        return replies
-
     def post_reply(self, comment_id: str, reply_text: str) -> bool:
         """
         Post a reply to a YouTube comment.
@@ -210,15 +399,17 @@ class YouTubeMonitor(BaseMonitor):
             print(f"   💡 Would reply to {comment_id}: {reply_text[:50]}...")
 
             # Uncomment when OAuth is implemented:
-            # self.youtube.comments().insert(
-            #     part='snippet',
-            #     body={
+            # self._http.post(
+            #     f'{_API_BASE}/comments',
+            #     params={'part': 'snippet'},
+            #     headers={'Authorization': f'Bearer {oauth_token}'},
+            #     json={
             #         'snippet': {
             #             'parentId': comment_id,
             #             'textOriginal': reply_text
             #         }
             #     }
-            # ).execute()
+            # )
 
             return False  # Set to True when OAuth is implemented
 
@@ -233,7 +424,5 @@ class YouTubeMonitor(BaseMonitor):
         Note: With API key auth, we don't have a clear "own channel" concept.
         Override this if you implement OAuth and want to skip own comments.
         """
-        # Could check against config.YOUTUBE_CHANNEL_NAME if set
-        if hasattr(self.config, 'YOUTUBE_CHANNEL_NAME'):
-            return mention.get('author') == self.config.YOUTUBE_CHANNEL_NAME
-        return False
+        # Checks against config.YOUTUBE_CHANNEL_NAME, bound once at init
+        return self._own_channel is not None and mention.get('author') == self._own_channel
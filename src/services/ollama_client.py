@@ -1,10 +1,27 @@
 import ollama
 from config.settings import Config
 
+# Built once: a byte-identical system prompt across requests lets the Ollama
+# server reuse its tokenized prefix KV cache, lowering time-to-first-token
+DEFAULT_SYSTEM_PROMPT = """You are a professional social media manager.
+Generate brief, friendly, and helpful responses to customer posts.
+Keep responses under 280 characters. Be empathetic and solution-oriented.
+Never make promises you can't keep. Always maintain brand voice.
+Make sure you stick closely to the canned examples and only tweak responses where necessary"""
+
 class OllamaClient:
+    # Replies are a few hundred characters over a short prompt; a tight
+    # context window keeps the server from allocating its default 4k/8k
+    # KV cache per request
+    NUM_CTX = 1024
+
     def __init__(self):
         self.model = Config.OLLAMA_MODEL
         self.host = Config.OLLAMA_HOST
+        # Built lazily: only async callers pay for the async client
+        self._async_client = None
+        # Reused message dict for the default system prompt
+        self._sys_msg = {'role': 'system', 'content': DEFAULT_SYSTEM_PROMPT}
     # parameters:
     # the users prompt (comment/post) 
     # prompt to prep system and give context
@@ -13,41 +30,97 @@ class OllamaClient:
         """Generate response using Ollama"""
         try:
             messages = []
-            
+
             if system_prompt:
-                messages.append({
-                    'role': 'system',
-                    'content': system_prompt
-                })
-            
+                # The shared dict keeps the default prompt byte-identical
+                # across calls (server-side prefix cache hit)
+                messages.append(self._sys_msg if system_prompt == DEFAULT_SYSTEM_PROMPT
+                                else {'role': 'system', 'content': system_prompt})
+
             messages.append({
                 'role': 'user',
                 'content': prompt
             })
-            
-            response = ollama.chat(
+
+            # Stream tokens and stop reading as soon as we have enough:
+            # the validator trims to MAX_RESPONSE_LENGTH anyway, so there is
+            # no point waiting for tokens that would be thrown away
+            stream = ollama.chat(
                 model=self.model,
                 messages=messages,
+                stream=True,
                 options={
                     'temperature': temperature,
                     'num_predict': max_tokens,
+                    'num_ctx': self.NUM_CTX,
                 }
             )
-            
-            return response['message']['content'].strip()
+
+            buf = ''
+            for chunk in stream:
+                buf += chunk['message']['content']
+                if len(buf) >= Config.MAX_RESPONSE_LENGTH:
+                    break
+                # A finished sentence past the minimum length is a complete
+                # reply — no need to wait for a second one
+                if len(buf) > Config.MIN_RESPONSE_LENGTH and buf.rstrip()[-1:] in '.!?':
+                    break
+
+            return buf.strip()
         
         except Exception as e:
             print(f"Error with Ollama: {e}")
             return None
     
-    def generate_with_context(self, post_content, intent, sentiment, canned_examples=""):
-        """Generate contextual response"""
-        system_prompt = """You are a professional social media manager. 
-Generate brief, friendly, and helpful responses to customer posts.
-Keep responses under 280 characters. Be empathetic and solution-oriented.
-Never make promises you can't keep. Always maintain brand voice. 
-Make sure you stick closely to the canned examples and only tweak responses where necessary"""
-        
+    async def generate_response_async(self, prompt, system_prompt="", max_tokens=150, temperature=0.7):
+        """
+        Async variant of generate_response. Awaiting the chat stream lets
+        several posts' generations overlap on the server instead of
+        serializing behind one blocking call; the early-break rules match
+        the sync path.
+        """
+        if self._async_client is None:
+            self._async_client = ollama.AsyncClient(host=self.host)
+
+        try:
+            messages = []
+
+            if system_prompt:
+                messages.append(self._sys_msg if system_prompt == DEFAULT_SYSTEM_PROMPT
+                                else {'role': 'system', 'content': system_prompt})
+
+            messages.append({
+                'role': 'user',
+                'content': prompt
+            })
+
+            stream = await self._async_client.chat(
+                model=self.model,
+                messages=messages,
+                stream=True,
+                options={
+                    'temperature': temperature,
+                    'num_predict': max_tokens,
+                    'num_ctx': self.NUM_CTX,
+                }
+            )
+
+            buf = ''
+            async for chunk in stream:
+                buf += chunk['message']['content']
+                if len(buf) >= Config.MAX_RESPONSE_LENGTH:
+                    break
+                if len(buf) > Config.MIN_RESPONSE_LENGTH and buf.rstrip()[-1:] in '.!?':
+                    break
+
+            return buf.strip()
+
+        except Exception as e:
+            print(f"Error with Ollama: {e}")
+            return None
+
+    def _context_prompts(self, post_content, intent, sentiment, canned_examples=""):
+        """Build the (system, user) prompt pair for a contextual reply"""
         user_prompt = f"""Customer post: "{post_content}"
 
 Intent: {intent}
@@ -56,5 +129,20 @@ Sentiment: {sentiment}
 {f'Similar past responses: {canned_examples}' if canned_examples else ''}
 
 Generate a brief, appropriate reply:"""
-        
-        return self.generate_response(user_prompt, system_prompt, max_tokens=100, temperature=0.7)
\ No newline at end of file
+
+        return DEFAULT_SYSTEM_PROMPT, user_prompt
+
+    def generate_with_context(self, post_content, intent, sentiment, canned_examples=""):
+        """Generate contextual response"""
+        system_prompt, user_prompt = self._context_prompts(
+            post_content, intent, sentiment, canned_examples
+        )
+        return self.generate_response(user_prompt, system_prompt, max_tokens=100, temperature=0.7)
+
+    async def generate_with_context_async(self, post_content, intent, sentiment, canned_examples=""):
+        """Async counterpart of generate_with_context"""
+        system_prompt, user_prompt = self._context_prompts(
+            post_content, intent, sentiment, canned_examples
+        )
+        return await self.generate_response_async(user_prompt, system_prompt,
+                                                  max_tokens=100, temperature=0.7)
\ No newline at end of file
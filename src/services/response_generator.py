@@ -1,37 +1,165 @@
+import asyncio
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+import numpy as np
 from services.ollama_client import OllamaClient
 from services.ml_models import MLModels
 from config.settings import Config
 
+# Compiled once; validate_response runs per generated reply
+_MD_RE = re.compile(r'\*+')
+_URL_RE = re.compile(r'https?://\S+')
+
+# MLModels (with its built canned index) per database path: constructing a
+# second ResponseGenerator against the same DB reuses the models and index
+# instead of re-running the embedding pass over the same corpus
+_INDEX_CACHE = {}
+
 class ResponseGenerator:
+    # Bounded LRU size for memoized responses (reposts/crossposts are common)
+    CACHE_MAX_SIZE = 1024
+
+    # Cap on concurrent Ollama generations in the async path — enough to
+    # keep the server busy without flooding it
+    OLLAMA_MAX_CONCURRENCY = 4
+
     def __init__(self, db):
         self.db = db
         self.ollama = OllamaClient()
-        self.ml_models = MLModels()
-        
-        # Build semantic index for canned responses
-        canned_responses = self.db.get_all_canned_responses()
-        self.ml_models.build_canned_response_index(canned_responses)
-    
+
+        # Memoized results keyed by content hash, oldest evicted first.
+        # The generator is shared across monitor threads, so every
+        # get/move_to_end/popitem on the OrderedDict goes through the lock
+        self._response_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        # Created lazily inside the running event loop by the async path
+        self._ollama_sem = None
+
+        # One MLModels + canned index per database for the whole process:
+        # platform monitors sharing a DB share the models, so the index is
+        # built (and the models loaded) exactly once
+        self.ml_models = _INDEX_CACHE.get(self.db.db_name)
+        if self.ml_models is None:
+            self.ml_models = MLModels()
+
+            # Build semantic index for canned responses (cached on the
+            # Database, so reloads don't re-query and re-decode the table)
+            canned_responses, response_embeddings = self.db.load_canned_index()
+            self.ml_models.build_canned_response_index(canned_responses)
+            if response_embeddings is not None:
+                # Stored response-text embeddings (fp16 on disk) back the
+                # fallback matching path without re-encoding
+                self.ml_models.canned_response_embeddings = response_embeddings.astype(np.float32)
+
+            _INDEX_CACHE[self.db.db_name] = self.ml_models
+
+    def _cache_key(self, post_content):
+        """
+        Hash the content so the cache doesn't hold full post texts as keys.
+        Normalized (stripped + casefolded) first, so reposts that differ
+        only in surrounding whitespace or letter case still hit.
+        """
+        normalized = post_content.strip().casefold()
+        return hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).digest()
+
+    def _cache_get(self, cache_key):
+        """Probe the LRU under the lock, refreshing recency on a hit."""
+        with self._cache_lock:
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                self._response_cache.move_to_end(cache_key)
+            return cached
+
     def generate_response(self, post_content):
         """Main method to generate response using ML pipeline"""
-        
+
+        # Duplicate content (reposts, crossposts, spam templates) skips the
+        # whole ML pipeline
+        cache_key = self._cache_key(post_content)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            print(f"  ♻️ Reusing cached response for duplicate content")
+            return cached
+
         # Classify intent using huggingface
         intent_result = self.ml_models.classify_intent(post_content)
+
+        # Classify sentiment using hugginface
+        sentiment_result = self.ml_models.analyze_sentiment(post_content)
+
+        return self._build_response(post_content, cache_key, intent_result, sentiment_result)
+
+    def generate_responses_batch(self, post_contents):
+        """
+        Generate responses for a whole cycle's worth of posts at once.
+        The intent and sentiment models each see one batched forward pass
+        instead of one call per post, which is the dominant per-cycle cost.
+        Returns results in the same order as post_contents.
+        """
+        results = [None] * len(post_contents)
+
+        # Resolve cache hits first so only misses hit the models
+        miss_indices = []
+        miss_keys = []
+        for i, post_content in enumerate(post_contents):
+            cache_key = self._cache_key(post_content)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                results[i] = cached
+            else:
+                miss_indices.append(i)
+                miss_keys.append(cache_key)
+
+        if miss_indices:
+            miss_texts = [post_contents[i] for i in miss_indices]
+
+            # Embed every query in one batched encode first: the same
+            # embeddings serve the intent classifier's semantic-cache probe
+            # and the canned matching below, so the encoder runs once per
+            # batch instead of twice
+            try:
+                query_embs = self.ml_models.embed_texts(miss_texts)
+            except Exception:
+                query_embs = None
+
+            # One batched pass per model across all new posts
+            intent_results = self.ml_models.classify_intents(
+                miss_texts, query_embeddings=query_embs
+            )
+            sentiment_results = self.ml_models.analyze_sentiments(miss_texts)
+
+            for j, (i, cache_key, text, intent_result, sentiment_result) in enumerate(zip(
+                    miss_indices, miss_keys, miss_texts, intent_results, sentiment_results)):
+                print(f"\n  📝 Post: {text[:60]}...")
+                results[i] = self._build_response(
+                    text, cache_key, intent_result, sentiment_result,
+                    query_embedding=query_embs[j] if query_embs is not None else None
+                )
+
+        return results
+
+    def _build_response(self, post_content, cache_key, intent_result, sentiment_result,
+                        query_embedding=None):
+        """Pick a canned or AI response given precomputed classifications"""
         intent = intent_result['intent']
         intent_confidence = intent_result['confidence']
         # Print intent and confidence in the score
         print(f"  🎯 Intent: {intent} (confidence: {intent_confidence:.2f})")
-        
-        # Classify sentiment using hugginface
-        sentiment_result = self.ml_models.analyze_sentiment(post_content)
+
         sentiment = sentiment_result['sentiment']
         sentiment_confidence = sentiment_result['confidence']
         # Print sentiment and confidence in the score
         print(f"  😊 Sentiment: {sentiment} (confidence: {sentiment_confidence:.2f})")
-        
-        # Find a proper canned response to the post using intent 
-        similar_response, similarity_score = self.ml_models.find_similar_response(post_content)
-        
+
+        # Find a proper canned response to the post using intent (reusing
+        # the batch-computed query embedding when one was handed in)
+        similar_response, similarity_score = self.ml_models.find_similar_response(
+            post_content, query_embedding=query_embedding
+        )
+
         print(f"  📋 Best canned match similarity: {similarity_score:.2f}")
         
         # Step 4: Decide response strategy
@@ -55,23 +183,78 @@ class ResponseGenerator:
             )
             
             response_type = 'ai'
-            
+
             if not response_text:
                 # Fallback if Ollama fails
                 response_text = "Thanks for reaching out! We'll get back to you soon. 😊"
                 response_type = 'fallback'
-        
-        # Validate response
-        response_text = self.validate_response(response_text, post_content)
-        
+
+        return self._finalize_response(post_content, cache_key, intent, sentiment,
+                                       intent_confidence, response_text, response_type,
+                                       similarity_score)
+
+    async def generate_response_async(self, post_content):
+        """
+        Async counterpart of generate_response. Classification and matching
+        run as usual, but the Ollama generation awaits the AsyncClient
+        behind a shared semaphore — a batch of posts overlaps its LLM calls
+        instead of serializing them one blocking request at a time.
+        """
+        cache_key = self._cache_key(post_content)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            print(f"  ♻️ Reusing cached response for duplicate content")
+            return cached
+
+        intent_result = self.ml_models.classify_intent(post_content)
+        sentiment_result = self.ml_models.analyze_sentiment(post_content)
+
+        intent = intent_result['intent']
+        intent_confidence = intent_result['confidence']
+        sentiment = sentiment_result['sentiment']
+
+        similar_response, similarity_score = self.ml_models.find_similar_response(post_content)
+
+        if similarity_score >= Config.CANNED_RESPONSE_THRESHOLD:
+            response_text = similar_response['text']
+            response_type = 'canned'
+        else:
+            canned_examples = similar_response['text'] if similar_response else ""
+
+            if self._ollama_sem is None:
+                self._ollama_sem = asyncio.Semaphore(self.OLLAMA_MAX_CONCURRENCY)
+
+            async with self._ollama_sem:
+                response_text = await self.ollama.generate_with_context_async(
+                    post_content, intent, sentiment, canned_examples
+                )
+
+            response_type = 'ai'
+            if not response_text:
+                response_text = "Thanks for reaching out! We'll get back to you soon. 😊"
+                response_type = 'fallback'
+
+        return self._finalize_response(post_content, cache_key, intent, sentiment,
+                                       intent_confidence, response_text, response_type,
+                                       similarity_score)
+
+    def _finalize_response(self, post_content, cache_key, intent, sentiment,
+                           intent_confidence, response_text, response_type,
+                           similarity_score):
+        """Validate, toxicity-check, cache, and package a chosen response"""
+        # Validate response (canned text comes straight from the DB and is
+        # known clean — only generated text needs the scrubbing)
+        response_text = self.validate_response(response_text, post_content,
+                                               skip=response_type == 'canned')
+
         # Check for toxicity
         is_toxic, toxic_word = self.ml_models.check_toxicity(response_text)
         if is_toxic:
             print(f"  ⚠️ Toxic content detected: {toxic_word}. Using safe fallback.")
             response_text = "Thank you for your message. We appreciate your feedback!"
             response_type = 'safe_fallback'
-        
-        return {
+
+        result = {
             'text': response_text,
             'type': response_type,
             'intent': intent,
@@ -79,24 +262,44 @@ class ResponseGenerator:
             'confidence': intent_confidence,
             'similarity_score': similarity_score
         }
-    
-    def validate_response(self, response, original_post):
+
+        # Don't memoize fallbacks: they mean Ollama was unreachable, and
+        # caching one would pin the generic reply to this content hash
+        # long after the outage ends instead of retrying the generation
+        if response_type != 'fallback':
+            with self._cache_lock:
+                self._response_cache[cache_key] = result
+                if len(self._response_cache) > self.CACHE_MAX_SIZE:
+                    self._response_cache.popitem(last=False)
+
+        return result
+
+
+    def validate_response(self, response, original_post, skip=False):
         """Validate and clean response"""
-        # Remove potential markdown
-        response = response.replace('**', '').replace('*', '')
-        
+        if skip:
+            return response.strip()
+
+        # Fast path: nothing to strip and already within bounds
+        if ('*' not in response and 'http' not in response
+                and Config.MIN_RESPONSE_LENGTH <= len(response) <= Config.MAX_RESPONSE_LENGTH):
+            return response.strip()
+
+        # Remove potential markdown (one pass, no intermediate copies)
+        response = _MD_RE.sub('', response)
+
         # Ensure proper length
         if len(response) > Config.MAX_RESPONSE_LENGTH:
             response = response[:Config.MAX_RESPONSE_LENGTH-3] + '...'
-        
+
         if len(response) < Config.MIN_RESPONSE_LENGTH:
             response = f"{response} Feel free to reach out if you have more questions!"
-        
+
         # Remove any potential hallucinations about brand details
         # (Ollama might invent details)
-        if '[LINK]' not in response and 'http' in response:
-            # Remove URLs that Ollama might have hallucinated
-            import re
-            response = re.sub(r'http\S+', '[LINK]', response)
-        
+        if '[LINK]' not in response:
+            # Remove URLs that Ollama might have hallucinated; sub() on a
+            # no-match string is a single cheap scan
+            response = _URL_RE.sub('[LINK]', response)
+
         return response.strip()
\ No newline at end of file